@@ -3,28 +3,55 @@
 
 from __future__ import annotations
 
+import heapq
+import io
+import itertools
 import json
 import os
 import re
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
+from typing import NamedTuple
 
 import requests
 
+import github_api
+from github_api import decode_json
+
 try:
     import tomllib
 except ImportError:
     import tomli as tomllib
 
+# rtoml is optional; it is a faster Rust TOML parser than tomllib/tomli
+try:
+    import rtoml
+except ImportError:
+    rtoml = None
+
+# orjson is optional; it is much faster than stdlib json for encoding and decoding
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 OUTPUT_DIR = Path("public")
 ADDONS_DIR = Path("addons")
 PREVIOUS_INDEX_PATH = OUTPUT_DIR / "index.json"
 VERSION_HISTORY_PATH = OUTPUT_DIR / "version-history.json"
 
 # GitHub API headers
-GITHUB_HEADERS = {}
-if token := os.environ.get("GITHUB_TOKEN"):
-    GITHUB_HEADERS["Authorization"] = f"token {token}"
+GITHUB_HEADERS = github_api.github_headers()
+
+# Release lookups are latency-bound, so they are fetched concurrently. Keep the
+# pool small enough to stay clear of GitHub's secondary rate limits.
+MAX_FETCH_WORKERS = int(os.environ.get("GH_CONCURRENCY", "8"))
+
+# Shared session so keep-alive connections are reused across all API calls
+SESSION = github_api.make_session(16, max(16, MAX_FETCH_WORKERS), GITHUB_HEADERS)
 
 
 # Version parsing regex - handles v1.0.0, 1.0.0, 1.0, 1.0.0-beta.1, etc.
@@ -35,11 +62,71 @@ VERSION_REGEX = re.compile(
     r"(?:[.\-](?P<minor>\d+))?"  # Minor version (optional, . or -)
     r"(?:[.\-](?P<patch>\d+))?"  # Patch version (optional, . or -)
     r"(?:[._-]?(?P<prerelease>(?:alpha|beta|rc|dev|pre|a|b)[\d.]*))?",  # Prerelease
-    re.IGNORECASE,
+    re.IGNORECASE | re.ASCII,
 )
 
+# Any of these markers anywhere in a version string means a prerelease
+PRERELEASE_REGEX = re.compile(r"alpha|beta|rc|dev|pre|-a\.|-b\.", re.IGNORECASE)
+
+# Full 40-character hex commit SHA
+COMMIT_SHA_REGEX = re.compile(r"[0-9a-f]{40}")
+
+
+class VersionTuple(NamedTuple):
+    """Parsed semver components of a version string."""
+
+    major: int
+    minor: int
+    patch: int
+    prerelease: str | None
+
 
-def parse_version(version_str: str | None) -> dict | None:
+class VersionInfo:
+    """Pre-computed version metadata for an index entry (``version_info``).
+
+    Slotted to keep per-entry memory low during the build; it becomes a plain
+    dict only when the index is serialized (see ``json_default``).
+    """
+
+    __slots__ = (
+        "version_normalized",
+        "version_sort_key",
+        "is_prerelease",
+        "release_channel",
+        "commit_message",
+    )
+
+    def __init__(
+        self,
+        version_normalized: VersionTuple | None,
+        version_sort_key: int | None,
+        is_prerelease: bool,
+        release_channel: str,
+        commit_message: str | None = None,
+    ):
+        self.version_normalized = version_normalized
+        self.version_sort_key = version_sort_key
+        self.is_prerelease = is_prerelease
+        self.release_channel = release_channel
+        self.commit_message = commit_message
+
+    def to_dict(self) -> dict:
+        """Return the JSON form; commit_message is only included when set."""
+        info = {
+            "version_normalized": self.version_normalized._asdict()
+            if self.version_normalized
+            else None,
+            "version_sort_key": self.version_sort_key,
+            "is_prerelease": self.is_prerelease,
+            "release_channel": self.release_channel,
+        }
+        if self.commit_message:
+            info["commit_message"] = self.commit_message
+        return info
+
+
+@lru_cache(maxsize=4096)
+def parse_version(version_str: str | None) -> VersionTuple | None:
     """Parse a version string into semver components.
 
     Handles various version formats:
@@ -48,33 +135,35 @@ def parse_version(version_str: str | None) -> dict | None:
     - Prefixed: Version-1.13.1, version_2.0.0
     - Prerelease: 1.0.0-beta.1, 2.0.0-rc1
 
-    Returns:
-        {
-            "major": int,
-            "minor": int,
-            "patch": int,
-            "prerelease": str | None
-        }
-        or None if parsing fails
+    Returns a VersionTuple (immutable, so results can be cached and shared),
+    or None if parsing fails. Use ``._asdict()`` for the JSON form.
     """
     if not version_str:
         return None
 
     version_clean = version_str.strip()
 
+    # Fast path for the common plain "1.2.3" / "v1.2" shape
+    plain = version_clean[1:] if version_clean.startswith(("v", "V")) else version_clean
+    parts = plain.split(".")
+    if len(parts) <= 3 and all(p.isascii() and p.isdigit() for p in parts):
+        parts += ["0"] * (3 - len(parts))
+        return VersionTuple(int(parts[0]), int(parts[1]), int(parts[2]), None)
+
     match = VERSION_REGEX.match(version_clean)
     if not match:
         return None
 
-    return {
-        "major": int(match.group("major")),
-        "minor": int(match.group("minor") or 0),
-        "patch": int(match.group("patch") or 0),
-        "prerelease": match.group("prerelease"),
-    }
+    return VersionTuple(
+        major=int(match.group("major")),
+        minor=int(match.group("minor") or 0),
+        patch=int(match.group("patch") or 0),
+        prerelease=match.group("prerelease"),
+    )
 
 
-def compute_version_sort_key(version_normalized: dict | None) -> int | None:
+@lru_cache(maxsize=4096)
+def compute_version_sort_key(version_normalized: VersionTuple | None) -> int | None:
     """Compute an integer sort key for version comparison.
 
     Format: major * 10^9 + minor * 10^6 + patch * 10^3 + prerelease_offset
@@ -84,16 +173,15 @@ def compute_version_sort_key(version_normalized: dict | None) -> int | None:
     if not version_normalized:
         return None
 
-    major = version_normalized.get("major", 0)
-    minor = version_normalized.get("minor", 0)
-    patch = version_normalized.get("patch", 0)
-    prerelease = version_normalized.get("prerelease")
-
     # Base sort key: higher = newer
-    base_key = major * 1_000_000_000 + minor * 1_000_000 + patch * 1_000
+    base_key = (
+        version_normalized.major * 1_000_000_000
+        + version_normalized.minor * 1_000_000
+        + version_normalized.patch * 1_000
+    )
 
     # Prerelease versions sort lower than stable
-    if prerelease:
+    if version_normalized.prerelease:
         # Subtract 1 to make prereleases sort before stable
         return base_key - 1
     else:
@@ -105,43 +193,147 @@ def detect_release_channel(version_str: str | None, install_method: str) -> str:
 
     Returns: 'stable', 'prerelease', or 'branch'
     """
-    if install_method == "branch":
-        return "branch"
+    return _analyze_version(version_str, install_method)[3]
+
 
+@lru_cache(maxsize=4096)
+def is_prerelease_version(version_str: str | None) -> bool:
+    """Check if a version string indicates a prerelease."""
     if not version_str:
-        return "stable"
+        return False
 
-    version_lower = version_str.lower()
-    prerelease_patterns = ["alpha", "beta", "rc", "dev", "pre", "-a.", "-b."]
+    return PRERELEASE_REGEX.search(version_str) is not None
 
-    for pattern in prerelease_patterns:
-        if pattern in version_lower:
-            return "prerelease"
 
-    return "stable"
+@lru_cache(maxsize=4096)
+def _analyze_version(
+    version_str: str | None, install_method: str
+) -> tuple[VersionTuple | None, int | None, bool, str]:
+    """Derive all version metadata for an entry in one cached call.
 
+    Returns (version_normalized, version_sort_key, is_prerelease,
+    release_channel), the positional order of VersionInfo's fields.
+    """
+    # For branch-based addons the version is a commit SHA, so don't parse it
+    if install_method == "branch":
+        return None, None, False, "branch"
+
+    is_prerelease = is_prerelease_version(version_str)
+    version_normalized = parse_version(version_str)
+    return (
+        version_normalized,
+        compute_version_sort_key(version_normalized),
+        is_prerelease,
+        "prerelease" if is_prerelease else "stable",
+    )
 
-def is_prerelease_version(version_str: str | None) -> bool:
-    """Check if a version string indicates a prerelease."""
-    if not version_str:
-        return False
 
-    version_lower = version_str.lower()
-    prerelease_patterns = ["alpha", "beta", "rc", "dev", "pre", "-a.", "-b."]
+def json_default(obj):
+    """Serialize build-time objects that JSON encoders don't handle natively."""
+    if isinstance(obj, VersionInfo):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+# Reusable stdlib encoders (json.dumps builds a new encoder per call with options)
+PRETTY_JSON_ENCODER = json.JSONEncoder(indent=2, ensure_ascii=False, default=json_default)
+COMPACT_JSON_ENCODER = json.JSONEncoder(
+    separators=(",", ":"), ensure_ascii=False, default=json_default
+)
+
+
+def dump_json(data, pretty: bool = True) -> bytes:
+    """Serialize data to UTF-8 JSON bytes, using orjson when available.
+
+    Pretty output uses 2-space indentation; compact output has no whitespace.
+    Both encoders produce identical bytes for the same data.
+    """
+    if orjson is not None:
+        return orjson.dumps(data, default=json_default, option=orjson.OPT_INDENT_2 if pretty else 0)
+    encoder = PRETTY_JSON_ENCODER if pretty else COMPACT_JSON_ENCODER
+    return encoder.encode(data).encode("utf-8")
+
+
+def load_json(path: Path):
+    """Read and parse a JSON file, using orjson when available."""
+    raw = path.read_bytes()
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
 
-    return any(pattern in version_lower for pattern in prerelease_patterns)
+def write_json(path: Path, data, pretty: bool = True) -> None:
+    """Write data to a JSON file."""
+    with open(path, "wb") as f:
+        f.write(dump_json(data, pretty))
+
+
+def write_index_files(index: dict, index_path: Path, min_path: Path) -> None:
+    """Write the pretty and minified index files.
+
+    The two files are encoded and written on separate threads so one file's
+    disk write overlaps the other's encode.
+    """
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        pretty = executor.submit(write_json, index_path, index)
+        compact = executor.submit(write_json, min_path, index, False)
+        pretty.result()
+        compact.result()
+
+
+def unchanged_index_generated_at(index: dict, index_path: Path, min_path: Path) -> str | None:
+    """Return the previous build's generated_at if nothing else in the index changed.
+
+    The minified index already on disk is compared byte-for-byte with this
+    build's index carrying the previous timestamp. Returns None if either file
+    is missing or unreadable, or anything other than generated_at differs.
+    """
+    if not index_path.exists():
+        return None
+
+    try:
+        previous_bytes = min_path.read_bytes()
+        previous = decode_json(previous_bytes)
+    except (OSError, ValueError):
+        return None
+
+    if not isinstance(previous, dict) or "generated_at" not in previous:
+        return None
+
+    candidate = {**index, "generated_at": previous["generated_at"]}
+    if dump_json(candidate, pretty=False) != previous_bytes:
+        return None
+    return previous["generated_at"]
 
 
 def load_toml(filepath: Path) -> dict | None:
-    """Load and parse a TOML file."""
+    """Load and parse a TOML file, using rtoml when available."""
     try:
-        with open(filepath, "rb") as f:
-            return tomllib.load(f)
+        text = Path(filepath).read_bytes().decode("utf-8")
+        if rtoml is not None:
+            return rtoml.loads(text)
+        return tomllib.loads(text)
     except Exception as e:
         print(f"Warning: Failed to load {filepath}: {e}")
         return None
 
 
+def list_addon_tomls() -> list[Path]:
+    """Return addons/*/addon.toml paths, sorted by addon directory name.
+
+    Uses a single os.scandir pass over ADDONS_DIR; the DirEntry type cache
+    avoids the per-component stats that Path.glob makes.
+    """
+    names = []
+    with os.scandir(ADDONS_DIR) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False) and os.path.isfile(
+                os.path.join(entry.path, "addon.toml")
+            ):
+                names.append(entry.name)
+    return [ADDONS_DIR / name / "addon.toml" for name in sorted(names)]
+
+
 def load_previous_index() -> dict:
     """Load the previous index.json if it exists.
 
@@ -151,8 +343,7 @@ def load_previous_index() -> dict:
         return {}
 
     try:
-        with open(PREVIOUS_INDEX_PATH) as f:
-            previous = json.load(f)
+        previous = load_json(PREVIOUS_INDEX_PATH)
         return {addon["slug"]: addon for addon in previous.get("addons", [])}
     except Exception as e:
         print(f"Warning: Failed to load previous index: {e}")
@@ -169,8 +360,7 @@ def load_version_history() -> dict:
         return {}
 
     try:
-        with open(VERSION_HISTORY_PATH) as f:
-            data = json.load(f)
+        data = load_json(VERSION_HISTORY_PATH)
         return data.get("addons", {})
     except Exception as e:
         print(f"Warning: Failed to load version history: {e}")
@@ -190,9 +380,6 @@ def update_version_history(
     """
     events = []
 
-    # Get or create history for this addon
-    addon_history = history.get(slug, [])
-
     # Get current version info
     release = current_entry.get("latest_release")
     if not release:
@@ -205,8 +392,11 @@ def update_version_history(
     if not current_version:
         return events
 
+    # Get or create history for this addon
+    addon_history = history.setdefault(slug, [])
+
     # Check if this version already exists in history
-    existing_versions = {h.get("version"): h for h in addon_history}
+    existing_versions = {h.get("version") for h in addon_history}
 
     if current_version not in existing_versions:
         # New version detected
@@ -238,9 +428,6 @@ def update_version_history(
                 }
             )
 
-    # Update history
-    history[slug] = addon_history
-
     return events
 
 
@@ -262,32 +449,16 @@ def has_addon_changed(current: dict, previous: dict) -> tuple[bool, str]:
         "install",
     ]
 
-    # Check version change first
-    current_version = (
-        current.get("latest_release", {}).get("version") if current.get("latest_release") else None
-    )
-    previous_version = (
-        previous.get("latest_release", {}).get("version")
-        if previous.get("latest_release")
-        else None
-    )
+    # A missing or null latest_release has no version or SHA
+    current_release = current.get("latest_release") or {}
+    previous_release = previous.get("latest_release") or {}
 
-    if current_version != previous_version:
+    # Check version change first
+    if current_release.get("version") != previous_release.get("version"):
         return True, "version"
 
     # Check commit SHA for branch-based addons
-    current_sha = (
-        current.get("latest_release", {}).get("commit_sha")
-        if current.get("latest_release")
-        else None
-    )
-    previous_sha = (
-        previous.get("latest_release", {}).get("commit_sha")
-        if previous.get("latest_release")
-        else None
-    )
-
-    if current_sha != previous_sha:
+    if current_release.get("commit_sha") != previous_release.get("commit_sha"):
         return True, "commit"
 
     # Check metadata fields
@@ -319,19 +490,83 @@ def compute_last_updated(current: dict, previous: dict | None, now: str) -> str:
 
     if reason in ("version", "commit"):
         # Use published_at from the new release if available
-        release = current.get("latest_release", {})
-        published_at = release.get("published_at") if release else None
-        return published_at or now
+        release = current.get("latest_release") or {}
+        return release.get("published_at") or now
 
     # Metadata changed, use current timestamp
     return now
 
 
-def fetch_latest_release(source: dict) -> dict | None:
+def cached_get(url: str) -> requests.Response:
+    """GET a GitHub REST API URL through the shared on-disk ETag cache."""
+    return github_api.cached_get(SESSION, url, GITHUB_HEADERS)
+
+
+# Fields fetched for each repository in a batched GraphQL query: the archived
+# flag and the latest release. ``tag.target`` is the object the release's tag
+# ref points at, matching the git/refs/tags lookup on the REST path.
+RELEASE_GRAPHQL_FRAGMENT = """
+fragment ReleaseFields on Repository {
+  isArchived
+  latestRelease {
+    tagName
+    publishedAt
+    tag { target { oid } }
+  }
+}
+"""
+
+
+def build_release_graphql_query(count: int) -> str:
+    """Build a query with ``count`` aliased repository fields (r0, r1, ...)."""
+    params = ", ".join(f"$o{i}: String!, $n{i}: String!" for i in range(count))
+    fields = "".join(
+        f"  r{i}: repository(owner: $o{i}, name: $n{i}) {{ ...ReleaseFields }}\n"
+        for i in range(count)
+    )
+    return f"query({params}) {{\n{fields}}}\n{RELEASE_GRAPHQL_FRAGMENT}"
+
+
+def fetch_releases_graphql(repos: list[str]) -> dict[str, dict]:
+    """Fetch latest-release and archived data for many repositories via GraphQL.
+
+    Returns a dict mapping repo -> ``repository`` object. Repos missing from
+    the result (no token, network error, repo not found, API error) should
+    fall back to the REST endpoints.
+    """
+    return github_api.fetch_graphql_repositories(
+        SESSION, GITHUB_HEADERS, repos, build_release_graphql_query
+    )
+
+
+def release_info_from_graphql(repo: str, repository: dict) -> dict | None:
+    """Build release info from a GraphQL repository object.
+
+    Produces the same shape as the REST release lookup. Returns None when the
+    repo has no published release, so callers fall back to fetch_latest_tag.
+    """
+    release = repository.get("latestRelease")
+    if not release:
+        return None
+
+    tag_name = release.get("tagName") or "unknown"
+    return {
+        "version": tag_name,
+        "download_url": f"https://api.github.com/repos/{repo}/zipball/{tag_name}",
+        "published_at": release.get("publishedAt"),
+        "commit_sha": ((release.get("tag") or {}).get("target") or {}).get("oid"),
+    }
+
+
+def fetch_latest_release(source: dict, repository: dict | None = None) -> dict | None:
     """Fetch latest release info from GitHub.
 
     For branch-based addons, fetches commit info instead of release/tag info.
     Includes commit SHA for all release types to enable precise version tracking.
+
+    ``repository`` is the object from fetch_releases_graphql, if the repo was
+    resolved there; it replaces the REST release lookup. Tags always come from
+    fetch_latest_tag.
     """
     if source.get("type") != "github":
         return None
@@ -345,27 +580,37 @@ def fetch_latest_release(source: dict) -> dict | None:
         if release_type == "branch":
             return fetch_branch_info(repo, branch)
 
+        # The batched GraphQL result replaces the releases/latest and refs calls;
+        # tags always come from /tags so both paths pick the same one
+        if release_type == "release" and repository is not None:
+            return release_info_from_graphql(repo, repository) or fetch_latest_tag(repo)
+
         if release_type == "release":
             url = f"https://api.github.com/repos/{repo}/releases/latest"
-            resp = requests.get(url, headers=GITHUB_HEADERS, timeout=10)
+            resp = cached_get(url)
 
             if not resp.ok:
                 # Try tags as fallback
                 return fetch_latest_tag(repo)
 
-            data = resp.json()
+            data = decode_json(resp.content)
             tag_name = data.get("tag_name", "unknown")
 
-            # Fetch commit SHA for the release tag
+            # Releases created from a specific commit already carry its SHA;
+            # only look up the tag ref when target_commitish is a branch name
             commit_sha = None
-            try:
-                tag_url = f"https://api.github.com/repos/{repo}/git/refs/tags/{tag_name}"
-                tag_resp = requests.get(tag_url, headers=GITHUB_HEADERS, timeout=10)
-                if tag_resp.ok:
-                    tag_data = tag_resp.json()
-                    commit_sha = tag_data.get("object", {}).get("sha")
-            except requests.RequestException:
-                pass
+            target_commitish = data.get("target_commitish") or ""
+            if COMMIT_SHA_REGEX.fullmatch(target_commitish):
+                commit_sha = target_commitish
+            else:
+                try:
+                    tag_url = f"https://api.github.com/repos/{repo}/git/refs/tags/{tag_name}"
+                    tag_resp = cached_get(tag_url)
+                    if tag_resp.ok:
+                        tag_data = decode_json(tag_resp.content)
+                        commit_sha = tag_data.get("object", {}).get("sha")
+                except requests.RequestException:
+                    pass
 
             return {
                 "version": tag_name,
@@ -386,11 +631,11 @@ def fetch_latest_tag(repo: str) -> dict | None:
     url = f"https://api.github.com/repos/{repo}/tags"
 
     try:
-        resp = requests.get(url, headers=GITHUB_HEADERS, timeout=10)
+        resp = cached_get(url)
         if not resp.ok:
             return None
 
-        tags = resp.json()
+        tags = decode_json(resp.content)
         if not tags:
             return None
 
@@ -403,9 +648,9 @@ def fetch_latest_tag(repo: str) -> dict | None:
         if commit_sha:
             try:
                 commit_url = f"https://api.github.com/repos/{repo}/commits/{commit_sha}"
-                commit_resp = requests.get(commit_url, headers=GITHUB_HEADERS, timeout=10)
+                commit_resp = cached_get(commit_url)
                 if commit_resp.ok:
-                    commit_data = commit_resp.json()
+                    commit_data = decode_json(commit_resp.content)
                     published_at = commit_data.get("commit", {}).get("committer", {}).get("date")
             except requests.RequestException:
                 pass
@@ -429,11 +674,11 @@ def fetch_branch_info(repo: str, branch: str) -> dict | None:
     url = f"https://api.github.com/repos/{repo}/commits/{branch}"
 
     try:
-        resp = requests.get(url, headers=GITHUB_HEADERS, timeout=10)
+        resp = cached_get(url)
         if not resp.ok:
             return None
 
-        data = resp.json()
+        data = decode_json(resp.content)
         commit = data.get("commit", {})
         committer = commit.get("committer", {})
         message = commit.get("message", "")
@@ -461,16 +706,56 @@ def fetch_repo_metadata(repo: str) -> dict:
     """Fetch repository metadata from GitHub including archived status."""
     url = f"https://api.github.com/repos/{repo}"
     try:
-        resp = requests.get(url, headers=GITHUB_HEADERS, timeout=10)
+        resp = cached_get(url)
         if not resp.ok:
             return {"archived": False}
-        data = resp.json()
+        data = decode_json(resp.content)
         return {"archived": data.get("archived", False)}
     except requests.RequestException as e:
         print(f"Warning: Failed to fetch repo metadata for {repo}: {e}")
         return {"archived": False}
 
 
+def fetch_remote_info(source: dict, repository: dict | None = None) -> tuple[dict | None, dict]:
+    """Fetch the latest release and repo metadata for one source.
+
+    ``repository`` is the source's GraphQL result, if any; it already carries
+    the archived status, so the REST metadata call is skipped.
+    """
+    release_info = fetch_latest_release(source, repository)
+    repo = source.get("repo")
+    repo_metadata = {"archived": False}
+    if repository is not None:
+        repo_metadata = {"archived": repository.get("isArchived", False)}
+    elif source.get("type") == "github" and repo:
+        repo_metadata = fetch_repo_metadata(repo)
+    return release_info, repo_metadata
+
+
+def fetch_all_remote_info(sources: list[dict]) -> list[tuple[dict | None, dict]]:
+    """Fetch release info and repo metadata for many sources concurrently.
+
+    GitHub repos are first resolved in batched GraphQL queries; the remaining
+    per-source requests run on a thread pool. Results are (release_info,
+    repo_metadata) pairs in the same order as ``sources``.
+    """
+    if not sources:
+        return []
+
+    repositories = fetch_releases_graphql(
+        [s["repo"] for s in sources if s.get("type") == "github" and s.get("repo")]
+    )
+
+    def fetch(source: dict) -> tuple[dict | None, dict]:
+        repository = None
+        if source.get("type") == "github":
+            repository = repositories.get(source.get("repo"))
+        return fetch_remote_info(source, repository)
+
+    with ThreadPoolExecutor(max_workers=min(MAX_FETCH_WORKERS, len(sources))) as executor:
+        return list(executor.map(fetch, sources))
+
+
 def build_addon_url(source: dict) -> str:
     """Build the addon URL from source info."""
     source_type = source.get("type", "github")
@@ -547,6 +832,12 @@ def build_download_sources(source: dict, release_info: dict | None) -> list[dict
     return sources
 
 
+# Files excluded when installing an addon. One list shared by every entry;
+# nothing mutates it, and it stays a list so it compares equal to the
+# excludes loaded back from the previous index.
+INSTALL_EXCLUDES = [".*", ".github", "tests", "*.md", "*.yml", "*.yaml"]
+
+
 def build_install_info(source: dict, addon: dict) -> dict:
     """Build install pipeline instructions for addon manager clients.
 
@@ -587,7 +878,7 @@ def build_install_info(source: dict, addon: dict) -> dict:
         "method": method,
         "extract_path": source_path if source_path else None,
         "target_folder": target_folder,
-        "excludes": [".*", ".github", "tests", "*.md", "*.yml", "*.yaml"],
+        "excludes": INSTALL_EXCLUDES,
     }
 
 
@@ -596,8 +887,13 @@ def build_addon_entry(
     fetch_releases: bool = True,
     status: str = "approved",
     archived: bool = False,
+    release_info: dict | None = None,
 ) -> dict:
-    """Build a single addon entry for the index."""
+    """Build a single addon entry for the index.
+
+    Release info is fetched by the caller (see ``fetch_all_remote_info``) so this
+    function does no network I/O.
+    """
     addon = data["addon"]
     source = data["source"]
     compatibility = data.get("compatibility", {})
@@ -635,42 +931,18 @@ def build_addon_entry(
     }
 
     if fetch_releases:
-        release_info = fetch_latest_release(source)
         entry["latest_release"] = release_info
 
         # Add download sources (jsDelivr primary, GitHub fallback)
         entry["download_sources"] = build_download_sources(source, release_info)
 
-        # Determine release channel first (needed for version parsing logic)
-        release_channel = detect_release_channel(
-            release_info.get("version") if release_info else None,
-            install_info["method"],
-        )
-
-        # Add version metadata for client convenience
+        # Add version metadata for client convenience; commit_message is
+        # branch-specific and only set for branch-based addons
         if release_info:
-            version_str = release_info.get("version")
-
-            # For branch-based addons, don't try to parse the commit SHA as a version
-            if release_channel == "branch":
-                version_normalized = None
-                version_sort_key = None
-            else:
-                version_normalized = parse_version(version_str)
-                version_sort_key = compute_version_sort_key(version_normalized)
-
-            entry["version_info"] = {
-                "version_normalized": version_normalized,
-                "version_sort_key": version_sort_key,
-                "is_prerelease": is_prerelease_version(version_str)
-                if release_channel != "branch"
-                else False,
-                "release_channel": release_channel,
-            }
-
-            # Include branch-specific commit info if available
-            if release_info.get("commit_message"):
-                entry["version_info"]["commit_message"] = release_info["commit_message"]
+            entry["version_info"] = VersionInfo(
+                *_analyze_version(release_info.get("version"), install_info["method"]),
+                commit_message=release_info.get("commit_message"),
+            )
         else:
             entry["version_info"] = None
 
@@ -697,9 +969,14 @@ def build_index(fetch_releases: bool = True) -> tuple[dict, dict, list[dict]]:
     # Track version change events for Atom feed
     all_version_events = []
 
+    # The one timestamp for this build. Pass it down (or use
+    # index["generated_at"]) instead of calling datetime.now() in per-addon or
+    # per-feed code, so every output of a build agrees on the time.
     now = datetime.now(timezone.utc).isoformat()
 
-    for toml_path in sorted(ADDONS_DIR.glob("*/addon.toml")):
+    # Parse and filter all TOMLs up front so releases can be fetched in one batch
+    selected = []
+    for toml_path in list_addon_tomls():
         data = load_toml(toml_path)
         if data is None:
             continue
@@ -710,20 +987,23 @@ def build_index(fetch_releases: bool = True) -> tuple[dict, dict, list[dict]]:
             print(f"Skipping {toml_path.parent.name}: status is '{status}'")
             continue
 
-        print(f"Processing: {toml_path.parent.name}")
+        selected.append((toml_path, data, status))
 
-        # Fetch repo metadata (including archived status) for GitHub repos
-        source = data.get("source", {})
-        repo = source.get("repo")
-        repo_metadata = {"archived": False}
-        if source.get("type") == "github" and repo and fetch_releases:
-            repo_metadata = fetch_repo_metadata(repo)
+    if fetch_releases:
+        print(f"Fetching release info for {len(selected)} addon(s)...")
+        remote_infos = fetch_all_remote_info([data.get("source", {}) for _, data, _ in selected])
+    else:
+        remote_infos = [(None, {"archived": False})] * len(selected)
+
+    for (toml_path, data, status), (release_info, repo_metadata) in zip(selected, remote_infos):
+        print(f"Processing: {toml_path.parent.name}")
 
         entry = build_addon_entry(
             data,
             fetch_releases=fetch_releases,
             status=status,
             archived=repo_metadata.get("archived", False),
+            release_info=release_info,
         )
 
         # Compute last_updated
@@ -747,36 +1027,89 @@ def build_index(fetch_releases: bool = True) -> tuple[dict, dict, list[dict]]:
     return index_data, version_history, all_version_events
 
 
-def build_json_feed(index: dict) -> dict:
-    """Build JSON Feed format for feed readers."""
-    items = []
+JSON_FEED_HEADER = {
+    "version": "https://jsonfeed.org/version/1.1",
+    "title": "ESO Addon Index",
+    "home_page_url": "https://github.com/brainsnorkel/eso-addon-index",
+    "feed_url": "https://xop.co/eso-addon-index/feed.json",
+}
 
-    for addon in index["addons"]:
-        release = addon.get("latest_release") or {}
-        repo = addon["source"]["repo"]
 
-        items.append(
-            {
-                "id": addon["slug"],
-                "title": f"{addon['name']} {release.get('version', '')}".strip(),
-                "url": f"https://github.com/{repo}",
-                "date_published": release.get("published_at"),
-                "date_modified": addon.get("last_updated"),
-                "authors": [{"name": a} for a in addon["authors"]],
-                "summary": addon["description"],
-                "tags": addon["tags"],
-            }
-        )
+def build_json_feed_item(addon: dict) -> dict:
+    """Build a single JSON Feed item for an addon."""
+    release = addon.get("latest_release") or {}
+    repo = addon["source"]["repo"]
 
     return {
-        "version": "https://jsonfeed.org/version/1.1",
-        "title": "ESO Addon Index",
-        "home_page_url": "https://github.com/brainsnorkel/eso-addon-index",
-        "feed_url": "https://xop.co/eso-addon-index/feed.json",
-        "items": items,
+        "id": addon["slug"],
+        "title": f"{addon['name']} {release.get('version', '')}".strip(),
+        "url": f"https://github.com/{repo}",
+        "date_published": release.get("published_at"),
+        "date_modified": addon.get("last_updated"),
+        "authors": [{"name": a} for a in addon["authors"]],
+        "summary": addon["description"],
+        "tags": addon["tags"],
     }
 
 
+def write_json_feed(path: Path, index: dict) -> None:
+    """Write the JSON Feed for feed readers, streaming one item at a time.
+
+    The items list is never materialized; each item is encoded and written
+    as it is built. The layout matches write_json's 2-space pretty output.
+    """
+    with open(path, "wb") as f:
+        f.write(b"{\n")
+        for key, value in JSON_FEED_HEADER.items():
+            f.write(b"  " + dump_json(key) + b": " + dump_json(value) + b",\n")
+        f.write(b'  "items": [')
+        separator = b"\n    "
+        for addon in index["addons"]:
+            item = dump_json(build_json_feed_item(addon))
+            f.write(separator + item.replace(b"\n", b"\n    "))
+            separator = b",\n    "
+        f.write(b"]\n}" if separator == b"\n    " else b"\n  ]\n}")
+
+
+# Translation table for escaping XML text and attribute values in one pass
+XML_ESCAPE_TABLE = str.maketrans(
+    {"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;", "'": "&apos;"}
+)
+
+
+def xml_escape(s: str | None) -> str:
+    """Escape a value for XML text or attribute content; None becomes ""."""
+    if s is None:
+        return ""
+    return str(s).translate(XML_ESCAPE_TABLE)
+
+
+ATOM_FEED_HEADER_TEMPLATE = """<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+  <title>ESO Addon Index - Version Updates</title>
+  <subtitle>Track version updates for Elder Scrolls Online addons</subtitle>
+  <link href="https://xop.co/eso-addon-index/releases.atom" rel="self"/>
+  <link href="https://xop.co/eso-addon-index/" rel="alternate"/>
+  <id>urn:eso-addon-index:releases</id>
+  <updated>{generated_at}</updated>
+  <author>
+    <name>ESO Addon Index</name>
+    <uri>https://github.com/brainsnorkel/eso-addon-index</uri>
+  </author>
+"""
+
+ATOM_ENTRY_TEMPLATE = """  <entry>
+    <id>{entry_id}</id>
+    <title>{title}</title>
+    <link href="{url}" rel="alternate"/>
+    <updated>{detected_at}</updated>
+    <summary>{summary}</summary>
+    <author>
+      <name>ESO Addon Index</name>
+    </author>
+  </entry>"""
+
+
 def build_atom_feed(version_events: list[dict], generated_at: str) -> str:
     """Build an Atom feed (XML) for version change events.
 
@@ -784,38 +1117,28 @@ def build_atom_feed(version_events: list[dict], generated_at: str) -> str:
     to track addon updates.
     """
 
-    # XML escape helper
-    def escape(s: str | None) -> str:
-        if s is None:
-            return ""
-        return (
-            str(s)
-            .replace("&", "&amp;")
-            .replace("<", "&lt;")
-            .replace(">", "&gt;")
-            .replace('"', "&quot;")
-            .replace("'", "&apos;")
-        )
+    buf = io.StringIO()
+    buf.write(ATOM_FEED_HEADER_TEMPLATE.format(generated_at=generated_at))
 
-    entries = []
+    separator = ""
     for event in version_events:
-        slug = escape(event.get("slug", ""))
-        name = escape(event.get("name", slug))
-        url = escape(event.get("url", ""))
+        slug = xml_escape(event.get("slug", ""))
+        name = xml_escape(event.get("name", slug))
+        url = xml_escape(event.get("url", ""))
         old_version = event.get("old_version")
-        new_version = escape(event.get("new_version", ""))
+        new_version = xml_escape(event.get("new_version", ""))
         detected_at = event.get("detected_at", generated_at)
 
         # Build title
         if old_version:
-            title = f"{name} updated: {escape(old_version)} → {new_version}"
+            title = f"{name} updated: {xml_escape(old_version)} → {new_version}"
         else:
             title = f"{name} added: {new_version}"
 
         # Build summary
         if old_version:
             summary = (
-                f"{name} has been updated from version {escape(old_version)} to {new_version}."
+                f"{name} has been updated from version {xml_escape(old_version)} to {new_version}."
             )
         else:
             summary = f"{name} version {new_version} has been added to the index."
@@ -823,37 +1146,23 @@ def build_atom_feed(version_events: list[dict], generated_at: str) -> str:
         # Create unique ID for this event
         entry_id = f"urn:eso-addon-index:{slug}:{new_version}"
 
-        entries.append(f"""  <entry>
-    <id>{entry_id}</id>
-    <title>{title}</title>
-    <link href="{url}" rel="alternate"/>
-    <updated>{detected_at}</updated>
-    <summary>{summary}</summary>
-    <author>
-      <name>ESO Addon Index</name>
-    </author>
-  </entry>""")
-
-    entries_xml = "\n".join(entries) if entries else ""
+        buf.write(separator)
+        buf.write(
+            ATOM_ENTRY_TEMPLATE.format(
+                entry_id=entry_id,
+                title=title,
+                url=url,
+                detected_at=detected_at,
+                summary=summary,
+            )
+        )
+        separator = "\n"
 
-    return f"""<?xml version="1.0" encoding="UTF-8"?>
-<feed xmlns="http://www.w3.org/2005/Atom">
-  <title>ESO Addon Index - Version Updates</title>
-  <subtitle>Track version updates for Elder Scrolls Online addons</subtitle>
-  <link href="https://xop.co/eso-addon-index/releases.atom" rel="self"/>
-  <link href="https://xop.co/eso-addon-index/" rel="alternate"/>
-  <id>urn:eso-addon-index:releases</id>
-  <updated>{generated_at}</updated>
-  <author>
-    <name>ESO Addon Index</name>
-    <uri>https://github.com/brainsnorkel/eso-addon-index</uri>
-  </author>
-{entries_xml}
-</feed>
-"""
+    buf.write("\n</feed>\n")
+    return buf.getvalue()
 
 
-def build_missing_dependencies_feed(index: dict) -> dict:
+def build_missing_dependencies_feed(index: dict, generated_at: str) -> dict:
     """Build a feed of dependencies that are referenced but not in the index.
 
     This helps identify addons that should be added to complete the dependency graph.
@@ -862,37 +1171,28 @@ def build_missing_dependencies_feed(index: dict) -> dict:
     available_slugs = {addon["slug"].lower() for addon in index["addons"]}
 
     # Track missing dependencies: {slug_lower: {"original_name": str, "type": set, "needed_by": list}}
-    missing: dict[str, dict] = {}
+    missing: defaultdict[str, dict] = defaultdict(
+        lambda: {"original_name": None, "types": set(), "needed_by": []}
+    )
 
     for addon in index["addons"]:
         compatibility = addon.get("compatibility", {})
         addon_info = {"slug": addon["slug"], "name": addon["name"]}
 
-        # Check required dependencies
-        for dep in compatibility.get("required_dependencies", []):
-            dep_lower = dep.lower()
-            if dep_lower not in available_slugs:
-                if dep_lower not in missing:
-                    missing[dep_lower] = {
-                        "original_name": dep,
-                        "types": set(),
-                        "needed_by": [],
-                    }
-                missing[dep_lower]["types"].add("required")
-                missing[dep_lower]["needed_by"].append(addon_info)
-
-        # Check optional dependencies
-        for dep in compatibility.get("optional_dependencies", []):
-            dep_lower = dep.lower()
-            if dep_lower not in available_slugs:
-                if dep_lower not in missing:
-                    missing[dep_lower] = {
-                        "original_name": dep,
-                        "types": set(),
-                        "needed_by": [],
-                    }
-                missing[dep_lower]["types"].add("optional")
-                missing[dep_lower]["needed_by"].append(addon_info)
+        # Check required dependencies, then optional ones
+        for dep_kind, deps in (
+            ("required", compatibility.get("required_dependencies", [])),
+            ("optional", compatibility.get("optional_dependencies", [])),
+        ):
+            for dep in deps:
+                dep_lower = dep.lower()
+                if dep_lower in available_slugs:
+                    continue
+                info = missing[dep_lower]
+                if info["original_name"] is None:
+                    info["original_name"] = dep
+                info["types"].add(dep_kind)
+                info["needed_by"].append(addon_info)
 
     # Convert to list format for JSON
     missing_list = []
@@ -921,7 +1221,7 @@ def build_missing_dependencies_feed(index: dict) -> dict:
 
     return {
         "version": "1.0",
-        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "generated_at": generated_at,
         "description": "Dependencies referenced by addons but not available in the index",
         "missing_count": len(missing_list),
         "missing_dependencies": missing_list,
@@ -939,8 +1239,7 @@ def load_existing_atom_events(output_dir: Path) -> list[dict]:
         return []
 
     try:
-        with open(history_path) as f:
-            data = json.load(f)
+        data = load_json(history_path)
         events = data.get("events", [])
         # Filter out invalid events where old and new versions are the same
         valid_events = [e for e in events if e.get("old_version") != e.get("new_version")]
@@ -979,17 +1278,32 @@ def main():
     # Build main index (now returns version history and events too)
     index, version_history, new_version_events = build_index(fetch_releases=not args.no_releases)
 
-    # Write full index
+    # If only the timestamp would change, keep the previous one so the index
+    # files are left untouched and every output of this build agrees with them
     index_path = output_dir / "index.json"
-    with open(index_path, "w") as f:
-        json.dump(index, f, indent=2)
-    print(f"Wrote: {index_path}")
-
-    # Write minified index
     min_path = output_dir / "index.min.json"
-    with open(min_path, "w") as f:
-        json.dump(index, f, separators=(",", ":"))
-    print(f"Wrote: {min_path}")
+    previous_generated_at = unchanged_index_generated_at(index, index_path, min_path)
+    if previous_generated_at is not None:
+        index["generated_at"] = previous_generated_at
+
+    # The JSON Feed and missing dependencies feed only read the index, so
+    # build them in the background while the files below are written
+    feed_executor = ThreadPoolExecutor(max_workers=2)
+    feed_path = output_dir / "feed.json"
+    feed_future = feed_executor.submit(write_json_feed, feed_path, index)
+    missing_future = feed_executor.submit(
+        build_missing_dependencies_feed, index, index["generated_at"]
+    )
+    feed_executor.shutdown(wait=False)
+
+    # Write full and minified index
+    if previous_generated_at is not None:
+        print(f"Unchanged: {index_path}")
+        print(f"Unchanged: {min_path}")
+    else:
+        write_index_files(index, index_path, min_path)
+        print(f"Wrote: {index_path}")
+        print(f"Wrote: {min_path}")
 
     # Write version history
     version_history_data = {
@@ -999,8 +1313,7 @@ def main():
         "addons": version_history,
     }
     version_history_path = output_dir / "version-history.json"
-    with open(version_history_path, "w") as f:
-        json.dump(version_history_data, f, indent=2)
+    write_json(version_history_path, version_history_data)
     print(f"Wrote: {version_history_path}")
 
     # Load existing Atom events and merge with new ones
@@ -1008,51 +1321,42 @@ def main():
 
     # Deduplicate events by (slug, version) - keep the earliest detection
     seen_events = {}
-    for event in existing_events + new_version_events:
-        key = (event.get("slug"), event.get("new_version"))
-        if key not in seen_events:
-            seen_events[key] = event
+    for event in itertools.chain(existing_events, new_version_events):
+        seen_events.setdefault((event.get("slug"), event.get("new_version")), event)
 
-    # Sort by detected_at descending (newest first), limit to 100 entries
-    all_events = sorted(
+    # Newest 100 by detected_at, newest first (same order as a full reverse sort)
+    all_events = heapq.nlargest(
+        100,
         seen_events.values(),
         key=lambda x: x.get("detected_at", ""),
-        reverse=True,
-    )[:100]
+    )
 
     # Save events history for future builds
     events_history_path = output_dir / "releases-history.json"
-    with open(events_history_path, "w") as f:
-        json.dump(
-            {
-                "version": "1.0",
-                "generated_at": index["generated_at"],
-                "events": all_events,
-            },
-            f,
-            indent=2,
-        )
+    write_json(
+        events_history_path,
+        {
+            "version": "1.0",
+            "generated_at": index["generated_at"],
+            "events": all_events,
+        },
+    )
     print(f"Wrote: {events_history_path}")
 
     # Write Atom feed
     atom_feed = build_atom_feed(all_events, index["generated_at"])
     atom_path = output_dir / "releases.atom"
-    with open(atom_path, "w", encoding="utf-8") as f:
-        f.write(atom_feed)
+    atom_path.write_bytes(atom_feed.encode("utf-8"))
     print(f"Wrote: {atom_path}")
 
-    # Write JSON Feed
-    feed = build_json_feed(index)
-    feed_path = output_dir / "feed.json"
-    with open(feed_path, "w") as f:
-        json.dump(feed, f, indent=2)
+    # Wait for the JSON Feed started above
+    feed_future.result()
     print(f"Wrote: {feed_path}")
 
     # Write missing dependencies feed
-    missing_deps = build_missing_dependencies_feed(index)
+    missing_deps = missing_future.result()
     missing_path = output_dir / "missing-dependencies.json"
-    with open(missing_path, "w") as f:
-        json.dump(missing_deps, f, indent=2)
+    write_json(missing_path, missing_deps)
     print(f"Wrote: {missing_path}")
 
     print()
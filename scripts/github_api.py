@@ -0,0 +1,264 @@
+"""Shared GitHub API helpers for the index scripts.
+
+The scripts run as ``python scripts/<name>.py``, which puts this directory on
+``sys.path``, so each of them imports this module as ``github_api``. Nothing
+here reads script state: the session, API headers (and with them the token)
+and cache policy are passed in by the caller.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# orjson is optional; it is much faster than stdlib json for decoding
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+GITHUB_GRAPHQL_URL = "https://api.github.com/graphql"
+
+# On-disk cache of GitHub responses for conditional (If-None-Match) requests
+GITHUB_CACHE_DIR = Path(".cache") / "github"
+CACHE_TTL_SECONDS = 600
+
+# Retry settings for rate-limited (403/429) GitHub responses
+RATE_LIMIT_RETRIES = 3
+RATE_LIMIT_MAX_WAIT = 60
+
+# Repositories per GraphQL request (each is an aliased ``repository`` field)
+GRAPHQL_BATCH_SIZE = 25
+
+
+def github_headers(base: dict | None = None) -> dict:
+    """Return API headers, with GITHUB_TOKEN authorization if it is set."""
+    headers = dict(base or {})
+    if token := os.environ.get("GITHUB_TOKEN"):
+        headers["Authorization"] = f"token {token}"
+    return headers
+
+
+def make_session(
+    pool_connections: int, pool_maxsize: int, headers: dict | None = None
+) -> requests.Session:
+    """Create a keep-alive session that retries transient 5xx responses.
+
+    ``headers`` are sent on every request. Leave them out if the session also
+    talks to non-API hosts, and pass them per call instead, so the token is
+    never sent elsewhere.
+    """
+    session = requests.Session()
+    if headers:
+        session.headers.update(headers)
+    session.mount(
+        "https://",
+        HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.5,
+                status_forcelist=[502, 503, 504],
+                raise_on_status=False,
+            ),
+        ),
+    )
+    return session
+
+
+def decode_json(raw: bytes):
+    """Decode a JSON response body, using orjson when available.
+
+    Decode errors are raised as ``requests.exceptions.InvalidJSONError`` so
+    callers handling ``requests.RequestException`` behave as with ``resp.json()``.
+    """
+    try:
+        if orjson is not None:
+            return orjson.loads(raw)
+        return json.loads(raw)
+    except ValueError as e:
+        raise requests.exceptions.InvalidJSONError(str(e)) from e
+
+
+def rate_limit_delay(resp: requests.Response, attempt: int) -> float | None:
+    """Return seconds to wait before retrying a rate-limited response.
+
+    Returns None if the response is not a rate-limit response (e.g. a plain
+    403 for a private repository).
+    """
+    if resp.status_code not in (403, 429):
+        return None
+
+    retry_after = resp.headers.get("Retry-After")
+    if retry_after and retry_after.isdigit():
+        delay = float(retry_after)
+    elif resp.headers.get("X-RateLimit-Remaining") == "0":
+        reset = resp.headers.get("X-RateLimit-Reset", "")
+        delay = float(reset) - time.time() if reset.isdigit() else 0.0
+    elif resp.status_code == 429:
+        delay = 0.0
+    else:
+        return None
+
+    # Exponential backoff floor in case the headers give no useful hint
+    return min(max(delay, 2.0**attempt), RATE_LIMIT_MAX_WAIT)
+
+
+def github_request(session: requests.Session, method: str, url: str, **kwargs) -> requests.Response:
+    """Send a GitHub API request, backing off and retrying when rate limited."""
+    kwargs.setdefault("timeout", 10)
+    for attempt in range(RATE_LIMIT_RETRIES + 1):
+        resp = session.request(method, url, **kwargs)
+        delay = rate_limit_delay(resp, attempt)
+        if delay is None or attempt == RATE_LIMIT_RETRIES:
+            return resp
+        print(f"Rate limited on {url}, retrying in {delay:.0f}s")
+        time.sleep(delay)
+    return resp
+
+
+def cached_response(url: str, body: str) -> requests.Response:
+    """Build a 200 response carrying a cached body."""
+    resp = requests.Response()
+    resp.status_code = 200
+    resp.url = url
+    resp.encoding = "utf-8"
+    resp._content = body.encode("utf-8")
+    return resp
+
+
+def cached_get(
+    session: requests.Session,
+    url: str,
+    headers: dict,
+    cache_dir: Path | None = None,
+    ttl: float | None = None,
+) -> requests.Response:
+    """GET a GitHub REST API URL using the on-disk ETag cache.
+
+    Responses younger than ``ttl`` seconds (default CACHE_TTL_SECONDS) are
+    served from ``cache_dir`` (default GITHUB_CACHE_DIR) without a request.
+    Older entries are revalidated with If-None-Match; a 304 costs no
+    rate-limit quota and returns the cached body.
+    """
+    if cache_dir is None:
+        cache_dir = GITHUB_CACHE_DIR
+    if ttl is None:
+        ttl = CACHE_TTL_SECONDS
+    cache_path = cache_dir / f"{hashlib.sha256(url.encode()).hexdigest()[:32]}.json"
+    cached = None
+    if cache_path.exists():
+        try:
+            with open(cache_path) as f:
+                cached = json.load(f)
+        except Exception:
+            cached = None
+
+    if cached and time.time() - cached.get("ts", 0) < ttl:
+        return cached_response(url, cached["body"])
+
+    headers = dict(headers)
+    if cached and cached.get("etag"):
+        headers["If-None-Match"] = cached["etag"]
+
+    resp = github_request(session, "GET", url, headers=headers)
+
+    if resp.status_code == 304 and cached:
+        cached["ts"] = time.time()
+    elif resp.status_code == 200 and resp.headers.get("ETag"):
+        cached = {"url": url, "etag": resp.headers["ETag"], "body": resp.text, "ts": time.time()}
+    else:
+        return resp
+
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        # A unique temp file per write, so concurrent fetches of one URL
+        # can't interleave into the same file before the rename
+        with tempfile.NamedTemporaryFile("w", dir=cache_dir, suffix=".tmp", delete=False) as f:
+            json.dump(cached, f)
+        os.replace(f.name, cache_path)
+    except OSError as e:
+        print(f"Warning: Failed to write GitHub cache for {url}: {e}")
+
+    if resp.status_code == 304:
+        return cached_response(url, cached["body"])
+    return resp
+
+
+def fetch_graphql_repositories(
+    session: requests.Session,
+    headers: dict,
+    items: list,
+    build_query: Callable[[int], str],
+    extra_variables: Callable[[int, object], dict] | None = None,
+    timeout: float = 10,
+) -> dict:
+    """Resolve many repositories with aliased GraphQL queries.
+
+    Each item is an ``owner/name`` string, or a tuple starting with one.
+    Items are queried in batches of GRAPHQL_BATCH_SIZE; ``build_query(count)``
+    must return a query with fields r0, r1, ... taking ``$o{i}``/``$n{i}``
+    (owner and name) plus whatever ``extra_variables(i, item)`` adds.
+
+    Returns a dict mapping item -> ``repository`` object. Items missing from
+    the result (no token, network error, repo not found, API error) should
+    fall back to the REST endpoints.
+    """
+    # GraphQL requires authentication
+    if "Authorization" not in headers:
+        return {}
+
+    # Deduplicate, and drop anything that isn't "owner/name"
+    items = [
+        item
+        for item in dict.fromkeys(items)
+        if re.fullmatch(r"[^/]+/[^/]+", item if isinstance(item, str) else item[0])
+    ]
+    results = {}
+
+    for start in range(0, len(items), GRAPHQL_BATCH_SIZE):
+        batch = items[start : start + GRAPHQL_BATCH_SIZE]
+        variables = {}
+        for i, item in enumerate(batch):
+            owner, _, name = (item if isinstance(item, str) else item[0]).partition("/")
+            variables[f"o{i}"] = owner
+            variables[f"n{i}"] = name
+            if extra_variables is not None:
+                variables.update(extra_variables(i, item))
+
+        try:
+            resp = github_request(
+                session,
+                "POST",
+                GITHUB_GRAPHQL_URL,
+                json={"query": build_query(len(batch)), "variables": variables},
+                headers=headers,
+                timeout=timeout,
+            )
+            if not resp.ok:
+                continue
+            payload = decode_json(resp.content)
+        except (requests.RequestException, ValueError) as e:
+            print(f"Warning: GraphQL query failed for {len(batch)} repo(s): {e}")
+            continue
+
+        # A repo that can't be resolved comes back as null with an entry in
+        # "errors"; the rest of the batch is still usable
+        data = payload.get("data") or {}
+        for i, item in enumerate(batch):
+            repository = data.get(f"r{i}")
+            if repository is not None:
+                results[item] = repository
+
+    return results
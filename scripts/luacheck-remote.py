@@ -2,24 +2,32 @@
 """Run Luacheck on remote addon repositories."""
 from __future__ import annotations
 
+import io
 import os
+import re
 import shutil
 import subprocess
 import sys
 import tempfile
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import requests
 
+import github_api
+
 try:
     import tomllib
 except ImportError:
     import tomli as tomllib
 
 # GitHub API headers
-GITHUB_HEADERS = {}
-if token := os.environ.get("GITHUB_TOKEN"):
-    GITHUB_HEADERS["Authorization"] = f"token {token}"
+GITHUB_HEADERS = github_api.github_headers()
+
+# Shared session so keep-alive connections are reused across downloads. API
+# headers are passed per call so the token is never sent to archive hosts.
+SESSION = github_api.make_session(4, 16)
 
 # Luacheck configuration for ESO addons
 LUACHECK_CONFIG = """
@@ -128,23 +136,34 @@ ignore = {
 """
 
 
+# Issue code printed by `luacheck --codes`, e.g. "file.lua:3:7: (W211) ..."
+LUACHECK_CODE_REGEX = re.compile(r": \(([EW])\d+\)")
+
+
 def load_toml(filepath: Path) -> dict | None:
     """Load and parse a TOML file."""
     try:
-        with open(filepath, "rb") as f:
-            return tomllib.load(f)
+        return tomllib.loads(Path(filepath).read_bytes().decode("utf-8"))
     except Exception as e:
         print(f"Warning: Failed to load {filepath}: {e}")
         return None
 
 
-def download_repo(repo: str, branch: str | None = None) -> Path | None:
-    """Download a repository to a temporary directory."""
+def cached_get(url: str) -> requests.Response:
+    """GET a GitHub REST API URL through the shared on-disk ETag cache."""
+    return github_api.cached_get(SESSION, url, GITHUB_HEADERS)
+
+
+def download_repo(repo: str, dest: Path, branch: str | None = None) -> Path | None:
+    """Download and extract a repository into dest.
+
+    Returns the extracted source directory (inside dest), or None on failure.
+    """
     # Get default branch if not specified
     if not branch:
         api_url = f"https://api.github.com/repos/{repo}"
         try:
-            resp = requests.get(api_url, headers=GITHUB_HEADERS, timeout=10)
+            resp = cached_get(api_url)
             if resp.ok:
                 branch = resp.json().get("default_branch", "main")
             else:
@@ -156,70 +175,101 @@ def download_repo(repo: str, branch: str | None = None) -> Path | None:
     zip_url = f"https://github.com/{repo}/archive/refs/heads/{branch}.zip"
 
     try:
-        resp = requests.get(zip_url, timeout=30)
+        resp = SESSION.get(zip_url, timeout=30)
         if not resp.ok:
             print(f"  Failed to download: HTTP {resp.status_code}")
             return None
 
-        # Extract to temp directory
-        temp_dir = Path(tempfile.mkdtemp(prefix="luacheck_"))
-        zip_path = temp_dir / "repo.zip"
-
-        with open(zip_path, "wb") as f:
-            f.write(resp.content)
-
-        # Extract
-        shutil.unpack_archive(zip_path, temp_dir)
-        zip_path.unlink()
+        # Extract straight from the downloaded bytes
+        with zipfile.ZipFile(io.BytesIO(resp.content)) as archive:
+            archive.extractall(dest)
 
         # Find extracted directory (usually repo-branch/)
-        extracted_dirs = [d for d in temp_dir.iterdir() if d.is_dir()]
+        extracted_dirs = [d for d in dest.iterdir() if d.is_dir()]
         if extracted_dirs:
             return extracted_dirs[0]
 
-        return temp_dir
+        return dest
 
     except Exception as e:
         print(f"  Error downloading repo: {e}")
         return None
 
 
-def run_luacheck(directory: Path) -> tuple[int, str]:
-    """Run Luacheck on a directory. Returns (exit_code, output)."""
+def run_luacheck(root: Path, targets: list[str]) -> tuple[int, str]:
+    """Run Luacheck once over several directories under root.
+
+    Returns (exit_code, output) with one issue per line, each prefixed with
+    the target path it was found under.
+    """
     # Check if luacheck is available
     if not shutil.which("luacheck"):
         return -1, "Luacheck not installed"
 
-    # Write temporary config
-    config_path = directory / ".luacheckrc"
+    # Write config next to the targets and pass it explicitly so any
+    # .luacheckrc shipped in an addon repository is not picked up instead
+    config_path = root / ".luacheckrc"
     with open(config_path, "w") as f:
         f.write(LUACHECK_CONFIG)
 
     try:
         result = subprocess.run(
-            ["luacheck", ".", "--no-color", "--codes"],
-            cwd=directory,
+            [
+                "luacheck",
+                *targets,
+                "--config",
+                str(config_path),
+                "--no-color",
+                "--codes",
+                "--formatter",
+                "plain",
+            ],
+            cwd=root,
             capture_output=True,
             text=True,
-            timeout=60,
+            timeout=60 * len(targets),
         )
-        return result.returncode, result.stdout + result.stderr
     except subprocess.TimeoutExpired:
         return -1, "Luacheck timed out"
     except Exception as e:
         return -1, f"Error running Luacheck: {e}"
 
+    # Exit code 3 means some files couldn't be checked and 4 is a critical
+    # error (bad config or arguments); neither gives usable per-addon output
+    if result.returncode >= 3:
+        return -1, f"Error running Luacheck: {result.stderr.strip()}"
+    return result.returncode, result.stdout + result.stderr
+
+
+def split_output(output: str, targets: list[str]) -> dict[str, str]:
+    """Split batched Luacheck output into per-target output.
+
+    Paths in each line are made relative to its target, so lines read as
+    they would from a run inside that directory.
+    """
+    lines = {target: [] for target in targets}
+    # Targets each live in their own top-level directory, so the first path
+    # component identifies which target a line belongs to
+    by_dir = {target.split("/", 1)[0]: target for target in targets}
+    for line in output.splitlines():
+        target = by_dir.get(line.split("/", 1)[0])
+        if target is not None and line.startswith(f"{target}/"):
+            lines[target].append(line[len(target) + 1 :])
+    return {target: "\n".join(target_lines) for target, target_lines in lines.items()}
+
 
 def analyze_output(output: str) -> dict:
     """Analyze Luacheck output and categorize issues."""
-    lines = output.strip().split("\n")
     errors = []
     warnings = []
 
-    for line in lines:
-        if ": (E" in line:
+    for line in output.strip().splitlines():
+        match = LUACHECK_CODE_REGEX.search(line)
+        if not match:
+            continue
+        if match.group(1) == "E":
             errors.append(line)
-        elif ": (W" in line:
+        else:
             warnings.append(line)
 
     return {
@@ -230,15 +280,18 @@ def analyze_output(output: str) -> dict:
     }
 
 
-def check_addon(toml_path: Path) -> dict:
-    """Run Luacheck on an addon from its TOML file."""
+def download_addon(toml_path: Path, dest: Path) -> tuple[Path | None, str | None]:
+    """Download an addon's source from its TOML file into dest.
+
+    Returns (source_dir, None) on success or (None, error) on failure.
+    """
     data = load_toml(toml_path)
     if data is None:
-        return {"success": False, "error": "Failed to load TOML"}
+        return None, "Failed to load TOML"
 
     source = data["source"]
     if source.get("type") != "github":
-        return {"success": False, "error": "Only GitHub repos supported"}
+        return None, "Only GitHub repos supported"
 
     repo = source.get("repo", "")
     branch = source.get("branch")
@@ -246,31 +299,79 @@ def check_addon(toml_path: Path) -> dict:
 
     print(f"Checking: {slug} ({repo})")
 
-    # Download repository
-    repo_dir = download_repo(repo, branch)
+    repo_dir = download_repo(repo, dest, branch)
     if repo_dir is None:
-        return {"success": False, "error": "Failed to download repository"}
-
-    try:
-        # Run Luacheck
-        exit_code, output = run_luacheck(repo_dir)
-
-        if exit_code == -1:
-            return {"success": False, "error": output}
-
-        analysis = analyze_output(output)
-        analysis["success"] = True
-        analysis["exit_code"] = exit_code
-        analysis["raw_output"] = output
+        return None, "Failed to download repository"
+    return repo_dir, None
+
+
+def check_addons(toml_paths: list[Path]) -> list[dict]:
+    """Run Luacheck on addons from their TOML files.
+
+    Downloads run concurrently, then every addon is checked by a single
+    Luacheck process and its output split back out per addon. If that run
+    fails, each addon is checked in its own process instead. Results are
+    returned in the order of toml_paths.
+    """
+    results: list[dict] = [{} for _ in toml_paths]
+
+    # Everything downloaded is removed when the context exits, on every path
+    with tempfile.TemporaryDirectory(prefix="luacheck_") as temp_dir:
+        root = Path(temp_dir)
+        dests = [root / str(i) for i in range(len(toml_paths))]
+        for dest in dests:
+            dest.mkdir()
+
+        with ThreadPoolExecutor(max_workers=min(len(toml_paths), os.cpu_count() or 1)) as executor:
+            downloads = list(executor.map(download_addon, toml_paths, dests))
+
+        # Luacheck paths are relative to root, e.g. "0/Repo-main"
+        targets = {}
+        for i, (repo_dir, error) in enumerate(downloads):
+            if repo_dir is None:
+                results[i] = {"success": False, "error": error}
+            else:
+                targets[i] = repo_dir.relative_to(root).as_posix()
+
+        if not targets:
+            return results
+
+        target_list = list(targets.values())
+        failures = {}
+        exit_code, output = run_luacheck(root, target_list)
+        if exit_code != -1:
+            outputs = split_output(output, target_list)
+        elif len(target_list) > 1 and shutil.which("luacheck"):
+            # One addon that hangs or crashes Luacheck fails the whole batch;
+            # check each on its own so only that addon is reported as failed
+            outputs = {}
+            for target in target_list:
+                exit_code, output = run_luacheck(root, [target])
+                if exit_code == -1:
+                    failures[target] = output
+                else:
+                    outputs.update(split_output(output, [target]))
+        else:
+            failures = dict.fromkeys(target_list, output)
+
+        for i, target in targets.items():
+            if target in failures:
+                results[i] = {"success": False, "error": failures[target]}
+                continue
+
+            analysis = analyze_output(outputs[target])
+            analysis["success"] = True
+            # Per-addon equivalent of Luacheck's exit code
+            if analysis["error_count"]:
+                analysis["exit_code"] = 2
+            elif analysis["warning_count"]:
+                analysis["exit_code"] = 1
+            else:
+                analysis["exit_code"] = 0
+            analysis["raw_output"] = outputs[target]
+            results[i] = analysis
 
-        return analysis
-
-    finally:
-        # Cleanup
-        try:
-            shutil.rmtree(repo_dir.parent)
-        except Exception:
-            pass
+    return results
 
 
 def main():
@@ -289,16 +390,26 @@ def main():
     all_results = []
     has_errors = False
 
+    filepaths = []
     for filepath_str in sys.argv[1:]:
         filepath = Path(filepath_str)
         if not filepath.exists():
             print(f"File not found: {filepath}")
             continue
+        filepaths.append(filepath)
+
+    # Results are reported below in command-line order
+    if filepaths:
+        results = check_addons(filepaths)
+        print()
+    else:
+        results = []
 
-        result = check_addon(filepath)
+    for filepath, result in zip(filepaths, results):
         result["file"] = str(filepath)
         all_results.append(result)
 
+        print(f"Results: {filepath}")
         if not result["success"]:
             print(f"  Error: {result.get('error', 'Unknown error')}")
             has_errors = True
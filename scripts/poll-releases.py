@@ -5,11 +5,15 @@ from __future__ import annotations
 
 import json
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
 
 import requests
 
+import github_api
+from github_api import decode_json
+
 try:
     import tomllib
 except ImportError:
@@ -19,21 +23,41 @@ ADDONS_DIR = Path("addons")
 CACHE_FILE = Path("public/versions.json")
 
 # GitHub API headers
-GITHUB_HEADERS = {"Accept": "application/vnd.github.v3+json"}
-if token := os.environ.get("GITHUB_TOKEN"):
-    GITHUB_HEADERS["Authorization"] = f"token {token}"
+GITHUB_HEADERS = github_api.github_headers({"Accept": "application/vnd.github.v3+json"})
+
+# Release lookups are latency-bound, so they are fetched concurrently. Keep the
+# pool small enough to stay clear of GitHub's secondary rate limits.
+MAX_FETCH_WORKERS = int(os.environ.get("GH_CONCURRENCY", "8"))
+
+# Shared session so keep-alive connections are reused across all API calls
+SESSION = github_api.make_session(16, max(16, MAX_FETCH_WORKERS), GITHUB_HEADERS)
 
 
 def load_toml(filepath: Path) -> dict | None:
     """Load and parse a TOML file."""
     try:
-        with open(filepath, "rb") as f:
-            return tomllib.load(f)
+        return tomllib.loads(Path(filepath).read_bytes().decode("utf-8"))
     except Exception as e:
         print(f"Warning: Failed to load {filepath}: {e}")
         return None
 
 
+def list_addon_tomls() -> list[Path]:
+    """Return addons/*/addon.toml paths, sorted by addon directory name.
+
+    Uses a single os.scandir pass over ADDONS_DIR; the DirEntry type cache
+    avoids the per-component stats that Path.glob makes.
+    """
+    names = []
+    with os.scandir(ADDONS_DIR) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False) and os.path.isfile(
+                os.path.join(entry.path, "addon.toml")
+            ):
+                names.append(entry.name)
+    return [ADDONS_DIR / name / "addon.toml" for name in sorted(names)]
+
+
 def load_version_cache() -> dict:
     """Load the existing version cache."""
     if CACHE_FILE.exists():
@@ -52,12 +76,17 @@ def save_version_cache(cache: dict) -> None:
         json.dump(cache, f, indent=2)
 
 
+def cached_get(url: str) -> requests.Response:
+    """GET a GitHub REST API URL through the shared on-disk ETag cache."""
+    return github_api.cached_get(SESSION, url, GITHUB_HEADERS)
+
+
 def get_latest_release(repo: str, release_type: str = "tag") -> dict | None:
     """Fetch the latest release or tag from GitHub."""
     try:
         if release_type == "release":
             url = f"https://api.github.com/repos/{repo}/releases/latest"
-            resp = requests.get(url, headers=GITHUB_HEADERS, timeout=10)
+            resp = cached_get(url)
 
             if resp.status_code == 404:
                 # No releases, try tags
@@ -66,7 +95,7 @@ def get_latest_release(repo: str, release_type: str = "tag") -> dict | None:
             if not resp.ok:
                 return None
 
-            data = resp.json()
+            data = decode_json(resp.content)
             return {
                 "version": data.get("tag_name", "unknown"),
                 "download_url": data.get("zipball_url"),
@@ -81,16 +110,20 @@ def get_latest_release(repo: str, release_type: str = "tag") -> dict | None:
         return None
 
 
-def get_latest_tag(repo: str) -> dict | None:
-    """Fetch the latest tag from GitHub."""
+def get_latest_tag(repo: str, with_date: bool = True) -> dict | None:
+    """Fetch the latest tag from GitHub.
+
+    With ``with_date=False`` the commit date lookup is skipped and
+    ``published_at`` is left as None for the caller to fill in.
+    """
     url = f"https://api.github.com/repos/{repo}/tags"
 
     try:
-        resp = requests.get(url, headers=GITHUB_HEADERS, timeout=10)
+        resp = cached_get(url)
         if not resp.ok:
             return None
 
-        tags = resp.json()
+        tags = decode_json(resp.content)
         if not tags:
             return None
 
@@ -99,16 +132,9 @@ def get_latest_tag(repo: str) -> dict | None:
         commit_sha = latest.get("commit", {}).get("sha")
 
         # Try to get commit date for the tag
-        commit_url = latest.get("commit", {}).get("url")
         published_at = None
-        if commit_url:
-            try:
-                commit_resp = requests.get(commit_url, headers=GITHUB_HEADERS, timeout=10)
-                if commit_resp.ok:
-                    commit_data = commit_resp.json()
-                    published_at = commit_data.get("commit", {}).get("committer", {}).get("date")
-            except requests.RequestException:
-                pass
+        if with_date and commit_sha:
+            published_at = get_commit_date(repo, commit_sha)
 
         return {
             "version": tag_name,
@@ -122,16 +148,62 @@ def get_latest_tag(repo: str) -> dict | None:
         return None
 
 
+def get_commit_date(repo: str, sha: str) -> str | None:
+    """Fetch the committer date of one commit."""
+    try:
+        resp = cached_get(f"https://api.github.com/repos/{repo}/commits/{sha}")
+        if resp.ok:
+            data = decode_json(resp.content)
+            return data.get("commit", {}).get("committer", {}).get("date")
+    except requests.RequestException:
+        pass
+    return None
+
+
+def build_commit_date_graphql_query(count: int) -> str:
+    """Build a query with ``count`` aliased repository fields (r0, r1, ...)."""
+    params = ", ".join(f"$o{i}: String!, $n{i}: String!, $s{i}: GitObjectID!" for i in range(count))
+    fields = "".join(
+        f"  r{i}: repository(owner: $o{i}, name: $n{i}) "
+        f"{{ object(oid: $s{i}) {{ ... on Commit {{ committedDate }} }} }}\n"
+        for i in range(count)
+    )
+    return f"query({params}) {{\n{fields}}}\n"
+
+
+def fetch_commit_dates_graphql(commits: dict[str, str]) -> dict[str, str]:
+    """Fetch committer dates for many (repo -> commit SHA) pairs via GraphQL.
+
+    One request replaces up to a batch's worth of per-tag commit REST calls.
+    Returns a dict mapping repo -> committed date; repos missing from the
+    result should fall back to get_commit_date.
+    """
+    repositories = github_api.fetch_graphql_repositories(
+        SESSION,
+        GITHUB_HEADERS,
+        list(commits.items()),
+        build_commit_date_graphql_query,
+        lambda i, pair: {f"s{i}": pair[1]},
+    )
+
+    results = {}
+    for (repo, _), repository in repositories.items():
+        commit = repository.get("object") or {}
+        if commit.get("committedDate"):
+            results[repo] = commit["committedDate"]
+    return results
+
+
 def get_branch_info(repo: str, branch: str) -> dict | None:
     """Fetch the latest commit info from a branch."""
     url = f"https://api.github.com/repos/{repo}/commits/{branch}"
 
     try:
-        resp = requests.get(url, headers=GITHUB_HEADERS, timeout=10)
+        resp = cached_get(url)
         if not resp.ok:
             return None
 
-        data = resp.json()
+        data = decode_json(resp.content)
         commit = data.get("commit", {})
         committer = commit.get("committer", {})
         message = commit.get("message", "")
@@ -156,6 +228,55 @@ def get_branch_info(repo: str, branch: str) -> dict | None:
         return None
 
 
+def fetch_release_info(repo: str, release_type: str, branch: str) -> dict | None:
+    """Fetch the latest version info for one addon source."""
+    # Use branch info for branch-based addons
+    if release_type == "branch":
+        return get_branch_info(repo, branch)
+    return get_latest_release(repo, release_type)
+
+
+def fetch_all_releases(jobs: list[tuple[str, str, str, str]]) -> list[dict | None]:
+    """Fetch version info for (slug, repo, release_type, branch) jobs concurrently.
+
+    Tag-based repos are resolved from /tags first, then their commit dates are
+    fetched in batched GraphQL queries. Results are returned in the same order
+    as ``jobs``.
+    """
+    if not jobs:
+        return []
+
+    tag_repos = list(
+        dict.fromkeys(
+            repo for _, repo, release_type, _ in jobs if release_type not in ("release", "branch")
+        )
+    )
+
+    with ThreadPoolExecutor(max_workers=min(MAX_FETCH_WORKERS, len(jobs))) as executor:
+        tags = dict(
+            zip(
+                tag_repos,
+                executor.map(lambda repo: get_latest_tag(repo, with_date=False), tag_repos),
+            )
+        )
+        dates = fetch_commit_dates_graphql(
+            {repo: info["commit_sha"] for repo, info in tags.items() if info and info["commit_sha"]}
+        )
+
+        def fetch(job: tuple[str, str, str, str]) -> dict | None:
+            _, repo, release_type, branch = job
+            if release_type in ("release", "branch"):
+                return fetch_release_info(repo, release_type, branch)
+
+            info = tags[repo]
+            if info and info["commit_sha"]:
+                published_at = dates.get(repo) or get_commit_date(repo, info["commit_sha"])
+                info = {**info, "published_at": published_at}
+            return info
+
+        return list(executor.map(fetch, jobs))
+
+
 def poll_all_addons() -> dict:
     """Poll all addons for their latest versions."""
     cache = load_version_cache()
@@ -163,7 +284,9 @@ def poll_all_addons() -> dict:
     new_versions = {}
     updates = []
 
-    for toml_path in sorted(ADDONS_DIR.glob("*/addon.toml")):
+    # Collect the addons to check first so their GitHub requests can overlap
+    jobs = []
+    for toml_path in list_addon_tomls():
         data = load_toml(toml_path)
         if data is None:
             continue
@@ -182,13 +305,12 @@ def poll_all_addons() -> dict:
         if source.get("type") != "github":
             continue
 
-        print(f"Checking: {slug} ({repo})")
+        jobs.append((slug, repo, release_type, branch))
 
-        # Use branch info for branch-based addons
-        if release_type == "branch":
-            release_info = get_branch_info(repo, branch)
-        else:
-            release_info = get_latest_release(repo, release_type)
+    release_infos = fetch_all_releases(jobs)
+
+    for (slug, repo, release_type, _), release_info in zip(jobs, release_infos):
+        print(f"Checking: {slug} ({repo})")
 
         if release_info:
             new_versions[slug] = release_info
@@ -3,8 +3,10 @@
 from __future__ import annotations
 
 import os
-import re
 import sys
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache, wraps
 from pathlib import Path
 from typing import List, Optional
 
@@ -15,7 +17,17 @@ try:
 except ImportError:
     import tomli as tomllib
 
-from jsonschema import ValidationError, validate
+# rtoml is optional; it is a faster Rust TOML parser than tomllib/tomli
+try:
+    import rtoml
+except ImportError:
+    rtoml = None
+
+from jsonschema.exceptions import best_match
+from jsonschema.validators import validator_for
+
+import github_api
+from github_api import decode_json
 
 SCHEMA = {
     "type": "object",
@@ -90,36 +102,48 @@ SCHEMA = {
     },
 }
 
+# Built once: jsonschema.validate() re-checks the schema and creates a new
+# validator on every call. Same validator class validate() would pick.
+SCHEMA_VALIDATOR_CLASS = validator_for(SCHEMA)
+SCHEMA_VALIDATOR_CLASS.check_schema(SCHEMA)
+SCHEMA_VALIDATOR = SCHEMA_VALIDATOR_CLASS(SCHEMA)
+
 # GitHub API headers
-GITHUB_HEADERS = {}
-if token := os.environ.get("GITHUB_TOKEN"):
-    GITHUB_HEADERS["Authorization"] = f"token {token}"
+GITHUB_HEADERS = github_api.github_headers()
+
+# Only the start of a manifest is needed to find its "## Title:" header
+MANIFEST_RANGE_HEADERS = {"Range": "bytes=0-8191"}
+
+# Shared session so keep-alive connections are reused across checks and files.
+# API headers are passed per call so the token is never sent to raw hosts.
+SESSION = github_api.make_session(4, 32)
 
 
 def load_toml(filepath: Path) -> dict | None:
-    """Load and parse a TOML file."""
+    """Load and parse a TOML file, using rtoml when available."""
     try:
-        with open(filepath, "rb") as f:
-            return tomllib.load(f)
-    except Exception as e:
+        text = Path(filepath).read_bytes().decode("utf-8")
+        if rtoml is not None:
+            return rtoml.loads(text)
+        return tomllib.loads(text)
+    except Exception:
         return None
 
 
 def validate_toml_schema(data: dict) -> list[str]:
     """Validate data against the JSON schema. Returns list of errors."""
     errors = []
-    try:
-        validate(instance=data, schema=SCHEMA)
-    except ValidationError as e:
-        errors.append(f"Schema error: {e.message}")
+    # best_match picks the same single error validate() would raise
+    error = best_match(SCHEMA_VALIDATOR.iter_errors(data))
+    if error is not None:
+        errors.append(f"Schema error: {error.message}")
     return errors
 
 
-def validate_slug_matches_directory(filepath: Path, data: dict) -> list[str]:
+def validate_slug_matches_directory(filepath: Path, actual_slug: str) -> list[str]:
     """Ensure slug matches the parent directory name."""
     errors = []
     expected_slug = filepath.parent.name
-    actual_slug = data.get("addon", {}).get("slug", "")
 
     if actual_slug != expected_slug:
         errors.append(f"Slug '{actual_slug}' doesn't match directory '{expected_slug}'")
@@ -127,16 +151,35 @@ def validate_slug_matches_directory(filepath: Path, data: dict) -> list[str]:
     return errors
 
 
-def validate_no_duplicate_slugs(filepath: Path, data: dict) -> list[str]:
+@lru_cache(maxsize=None)
+def list_addon_slugs(addons_dir: Path) -> frozenset[str]:
+    """Return the slugs (directory names) of every addon.toml in addons_dir.
+
+    Cached so validating many files lists the directory only once. Uses a
+    single os.scandir pass, like build-index.py's list_addon_tomls.
+    """
+    slugs = set()
+    try:
+        with os.scandir(addons_dir) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False) and os.path.isfile(
+                    os.path.join(entry.path, "addon.toml")
+                ):
+                    slugs.add(entry.name)
+    except OSError:
+        pass
+    return frozenset(slugs)
+
+
+def validate_no_duplicate_slugs(filepath: Path, actual_slug: str) -> list[str]:
     """Check for duplicate slugs in the addons directory."""
     errors = []
     addons_dir = filepath.parent.parent
-    actual_slug = data.get("addon", {}).get("slug", "")
 
-    existing_slugs = set()
-    for addon_toml in addons_dir.glob("*/addon.toml"):
-        if addon_toml != filepath:
-            existing_slugs.add(addon_toml.parent.name)
+    existing_slugs = list_addon_slugs(addons_dir)
+    if filepath.name == "addon.toml":
+        # The file being validated is not a duplicate of itself
+        existing_slugs = existing_slugs - {filepath.parent.name}
 
     if actual_slug in existing_slugs:
         errors.append(f"Duplicate slug: '{actual_slug}' already exists")
@@ -144,47 +187,169 @@ def validate_no_duplicate_slugs(filepath: Path, data: dict) -> list[str]:
     return errors
 
 
-def check_github_repository(repo: str) -> list[str]:
-    """Verify GitHub repository exists and is accessible."""
+def cached_get(url: str) -> requests.Response:
+    """GET a GitHub REST API URL through the shared on-disk ETag cache."""
+    return github_api.cached_get(SESSION, url, GITHUB_HEADERS)
+
+
+# Fields fetched for each source in a batched GraphQL query: everything the
+# repository, manifest listing, and release checks need except the manifest
+# text itself. The directory listing is queried per source with a
+# "HEAD:<path>" expression (see build_source_graphql_query).
+SOURCE_GRAPHQL_FRAGMENT = """
+fragment SourceFields on Repository {
+  defaultBranchRef { name }
+  refs(refPrefix: "refs/tags/", first: 1) { totalCount }
+  releases(first: 1) { totalCount }
+}
+"""
+
+# (repo, path) -> GraphQL ``repository`` object, filled by fetch_sources_graphql.
+# Sources missing here are checked with the REST endpoints instead.
+GRAPHQL_SOURCES: dict[tuple[str, str | None], dict] = {}
+
+
+def build_source_graphql_query(count: int) -> str:
+    """Build a query with ``count`` aliased repository fields (r0, r1, ...)."""
+    params = ", ".join(f"$o{i}: String!, $n{i}: String!, $e{i}: String!" for i in range(count))
+    fields = "".join(
+        f"  r{i}: repository(owner: $o{i}, name: $n{i}) {{\n"
+        f"    ...SourceFields\n"
+        f"    object(expression: $e{i}) {{ ... on Tree {{ entries {{ name type }} }} }}\n"
+        f"  }}\n"
+        for i in range(count)
+    )
+    return f"query({params}) {{\n{fields}}}\n{SOURCE_GRAPHQL_FRAGMENT}"
+
+
+def fetch_sources_graphql(sources: list[tuple[str, str | None]]) -> None:
+    """Prefetch check data for many (repo, path) sources via GraphQL.
+
+    Results are stored in GRAPHQL_SOURCES. Anything that can't be resolved
+    (no token, network error, repo not found, API error) is left out and falls
+    back to REST, which also produces the detailed error messages.
+    """
+    def tree_expression(i, source):
+        _, path = source
+        return {f"e{i}": f"HEAD:{path.strip('/')}" if path else "HEAD:"}
+
+    pending = [source for source in sources if source not in GRAPHQL_SOURCES]
+    GRAPHQL_SOURCES.update(github_api.fetch_graphql_repositories(
+        SESSION, GITHUB_HEADERS, pending, build_source_graphql_query, tree_expression,
+        timeout=30,
+    ))
+
+
+def single_flight(func):
+    """Memoize func on its (hashable) positional arguments, across threads.
+
+    Unlike lru_cache, a caller asking for a key that another thread is still
+    computing waits for that result instead of computing it again, so
+    concurrent files sharing a source only hit the API once.
+    """
+    lock = threading.Lock()
+    futures: dict[tuple, Future] = {}
+
+    @wraps(func)
+    def wrapper(*args):
+        with lock:
+            future = futures.get(args)
+            owner = future is None
+            if owner:
+                future = futures[args] = Future()
+        if owner:
+            try:
+                future.set_result(func(*args))
+            except BaseException as e:
+                future.set_exception(e)
+        return future.result()
+
+    def cache_clear():
+        with lock:
+            futures.clear()
+
+    wrapper.cache_clear = cache_clear
+    return wrapper
+
+
+@single_flight
+def fetch_repository(repo: str) -> tuple[tuple[str, ...], dict | None]:
+    """Look up a repository via REST. Returns (errors, metadata).
+
+    Keyed on repo alone, so sources that differ only in branch, path or
+    release type share the one request.
+    """
     errors = []
+    metadata = None
     api_url = f"https://api.github.com/repos/{repo}"
 
     try:
-        resp = requests.get(api_url, headers=GITHUB_HEADERS, timeout=10)
+        resp = cached_get(api_url)
         if resp.status_code == 404:
             errors.append(f"Repository not found: {repo}")
         elif resp.status_code == 403:
             errors.append(f"Repository access denied (may be private): {repo}")
         elif not resp.ok:
             errors.append(f"Failed to access repository: {repo} (HTTP {resp.status_code})")
+        else:
+            metadata = decode_json(resp.content)
     except requests.RequestException as e:
         errors.append(f"Network error checking repository: {e}")
 
-    return errors
+    return tuple(errors), metadata
+
+
+def check_github_repository(
+    repo: str, repository: dict | None = None
+) -> tuple[list[str], dict | None]:
+    """Verify GitHub repository exists and is accessible.
+
+    Returns (errors, repository metadata). The metadata is None unless the
+    repository was found, and lets callers reuse fields like default_branch
+    without requesting the repository again.
+
+    ``repository`` is the object from fetch_sources_graphql, if the source was
+    resolved there; otherwise the REST endpoint is used.
+    """
+    # Resolved by GraphQL, so it exists; an empty repo has no default branch
+    # and is left to the REST check
+    default_branch = ((repository or {}).get("defaultBranchRef") or {}).get("name")
+    if default_branch:
+        return [], {"default_branch": default_branch}
 
+    errors, metadata = fetch_repository(repo)
+    return list(errors), metadata
 
-def check_eso_manifest(repo: str, branch: str | None = None, path: str | None = None) -> list[str]:
+
+def get_default_branch(repo: str) -> str:
+    """Look up a repository's default branch, falling back to "main"."""
+    api_url = f"https://api.github.com/repos/{repo}"
+    try:
+        resp = cached_get(api_url)
+        if resp.ok:
+            return decode_json(resp.content).get("default_branch", "main")
+    except requests.RequestException:
+        pass
+    return "main"
+
+
+def check_eso_manifest(
+    repo: str,
+    branch: str | None = None,
+    path: str | None = None,
+    repository: dict | None = None,
+) -> list[str]:
     """Check if repository contains a valid ESO addon manifest.
 
     Args:
         repo: Repository path (owner/repo format)
         branch: Branch to check (defaults to repo's default branch)
         path: Subdirectory path if addon is not at repo root
+        repository: Object from fetch_sources_graphql; its directory listing
+            replaces the contents request when present
     """
     errors = []
 
-    # Get default branch if not specified
-    if not branch:
-        api_url = f"https://api.github.com/repos/{repo}"
-        try:
-            resp = requests.get(api_url, headers=GITHUB_HEADERS, timeout=10)
-            if resp.ok:
-                branch = resp.json().get("default_branch", "main")
-            else:
-                branch = "main"
-        except requests.RequestException:
-            branch = "main"
-
     # Build contents URL (with optional subdirectory path)
     if path:
         contents_url = f"https://api.github.com/repos/{repo}/contents/{path}"
@@ -193,30 +358,47 @@ def check_eso_manifest(repo: str, branch: str | None = None, path: str | None =
         contents_url = f"https://api.github.com/repos/{repo}/contents"
         location_desc = "repository root"
 
-    try:
-        resp = requests.get(contents_url, headers=GITHUB_HEADERS, timeout=10)
-        if not resp.ok:
-            if resp.status_code == 404 and path:
-                errors.append(f"Subdirectory '{path}' not found in repository")
-            else:
-                errors.append(f"Could not list repository contents: HTTP {resp.status_code}")
-            return errors
+    # Directory listing from GraphQL, if the path resolved to a directory there
+    tree = ((repository or {}).get("object") or {}).get("entries")
 
-        files = resp.json()
-        if not isinstance(files, list):
-            errors.append("Unexpected repository structure")
-            return errors
+    try:
+        if tree is not None:
+            file_names = [entry["name"] for entry in tree if entry.get("type") == "blob"]
+        else:
+            resp = cached_get(contents_url)
+            if not resp.ok:
+                if resp.status_code == 404 and path:
+                    errors.append(f"Subdirectory '{path}' not found in repository")
+                else:
+                    errors.append(f"Could not list repository contents: HTTP {resp.status_code}")
+                return errors
+
+            files = decode_json(resp.content)
+            if not isinstance(files, list):
+                errors.append("Unexpected repository structure")
+                return errors
+
+            file_names = [f["name"] for f in files if f.get("type") == "file"]
 
         # ESO manifests can be .txt or .addon files
         manifest_files = [
-            f["name"] for f in files
-            if f.get("type") == "file" and (f["name"].endswith(".txt") or f["name"].endswith(".addon"))
+            name for name in file_names
+            if name.endswith(".txt") or name.endswith(".addon")
         ]
 
         if not manifest_files:
             errors.append(f"No addon manifest (.txt or .addon) found in {location_desc}")
             return errors
 
+        # ESO names the manifest after the addon folder, so try that one first;
+        # it is usually the only raw download needed
+        folder = (path or repo).rstrip("/").rsplit("/", 1)[-1].lower()
+        manifest_files.sort(key=lambda name: name.rsplit(".", 1)[0].lower() != folder)
+
+        # Get default branch if not specified; only the raw manifest URLs need it
+        if not branch:
+            branch = get_default_branch(repo)
+
         # Check at least one manifest file has ESO manifest format
         manifest_found = False
         for manifest_file in manifest_files:
@@ -225,8 +407,10 @@ def check_eso_manifest(repo: str, branch: str | None = None, path: str | None =
             else:
                 raw_url = f"https://raw.githubusercontent.com/{repo}/{branch}/{manifest_file}"
             try:
-                resp = requests.get(raw_url, timeout=10)
-                if resp.ok and "## Title:" in resp.text:
+                # The header block is at the top of the manifest; a server
+                # that ignores Range just returns the whole file with a 200
+                resp = SESSION.get(raw_url, headers=MANIFEST_RANGE_HEADERS, timeout=10)
+                if resp.ok and b"## Title:" in resp.content:
                     manifest_found = True
                     break
             except requests.RequestException:
@@ -241,26 +425,39 @@ def check_eso_manifest(repo: str, branch: str | None = None, path: str | None =
     return errors
 
 
-def check_has_releases(repo: str, release_type: str = "tag") -> list[str]:
-    """Check if repository has at least one release, tag, or valid branch."""
+def check_has_releases(
+    repo: str, release_type: str = "tag", repository: dict | None = None
+) -> list[str]:
+    """Check if repository has at least one release, tag, or valid branch.
+
+    ``repository`` is the object from fetch_sources_graphql; its release and
+    tag counts replace the REST request when present.
+    """
     errors = []
 
     if release_type == "release":
-        url = f"https://api.github.com/repos/{repo}/releases"
+        url = f"https://api.github.com/repos/{repo}/releases?per_page=1"
+        count_field = "releases"
     elif release_type == "branch":
         # For branch-based releases, we just need the branch to exist
         # which is already validated in check_manifest_exists
         return errors
     else:
-        url = f"https://api.github.com/repos/{repo}/tags"
+        url = f"https://api.github.com/repos/{repo}/tags?per_page=1"
+        count_field = "refs"
+
+    if repository is not None and repository.get(count_field) is not None:
+        if not repository[count_field].get("totalCount"):
+            errors.append(f"No {release_type}s found in repository")
+        return errors
 
     try:
-        resp = requests.get(url, headers=GITHUB_HEADERS, timeout=10)
+        resp = cached_get(url)
         if not resp.ok:
             errors.append(f"Could not check releases/tags: HTTP {resp.status_code}")
             return errors
 
-        data = resp.json()
+        data = decode_json(resp.content)
         if not data:
             errors.append(f"No {release_type}s found in repository")
 
@@ -270,10 +467,46 @@ def check_has_releases(repo: str, release_type: str = "tag") -> list[str]:
     return errors
 
 
-def validate_repository(data: dict) -> list[str]:
-    """Validate the source repository."""
+@single_flight
+def check_github_source(
+    repo: str, branch: str | None, path: str | None, release_type: str
+) -> tuple[str, ...]:
+    """Run the repository, manifest, and release checks for one GitHub source.
+
+    Memoized so addons sharing a repository (and branch/path/release type)
+    are only checked once per run, even when validated concurrently. Returns
+    a tuple so cached results can't be modified by callers.
+    """
+    errors = []
+    repository = GRAPHQL_SOURCES.get((repo, path))
+
+    # Check repository exists
+    repo_errors, metadata = check_github_repository(repo, repository)
+    if repo_errors:
+        return tuple(repo_errors)  # Don't continue if repo doesn't exist
+
+    # Default branch comes from the metadata just fetched, so the manifest
+    # check doesn't need to look it up again
+    if not branch:
+        branch = metadata.get("default_branch", "main")
+
+    # The manifest and release checks are independent, so run them together
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        # Check for ESO manifest (in root or subdirectory)
+        manifest_future = executor.submit(check_eso_manifest, repo, branch, path, repository)
+
+        # Check for releases/tags
+        releases_future = executor.submit(check_has_releases, repo, release_type, repository)
+
+        errors.extend(manifest_future.result())
+        errors.extend(releases_future.result())
+
+    return tuple(errors)
+
+
+def validate_repository(source: dict) -> list[str]:
+    """Validate the source repository (the TOML's [source] table)."""
     errors = []
-    source = data.get("source", {})
 
     if source.get("type") != "github":
         # Only GitHub validation implemented for now
@@ -284,43 +517,57 @@ def validate_repository(data: dict) -> list[str]:
     path = source.get("path")  # Subdirectory path (optional)
     release_type = source.get("release_type", "tag")
 
-    # Check repository exists
-    repo_errors = check_github_repository(repo)
-    if repo_errors:
-        return repo_errors  # Don't continue if repo doesn't exist
-
-    # Check for ESO manifest (in root or subdirectory)
-    errors.extend(check_eso_manifest(repo, branch, path))
-
-    # Check for releases/tags
-    errors.extend(check_has_releases(repo, release_type))
-
+    errors.extend(check_github_source(repo, branch, path, release_type))
     return errors
 
 
-def validate_file(filepath: Path, check_repo: bool = True) -> list[str]:
-    """Validate a single TOML file. Returns list of errors."""
+def check_toml_file(filepath: Path) -> tuple[dict | None, list[str]]:
+    """Parse a TOML file and run the local (non-network) checks.
+
+    Returns the parsed data (None if it couldn't be parsed) and any errors.
+    """
     errors = []
 
     # Check file exists
     if not filepath.exists():
-        return [f"File not found: {filepath}"]
+        return None, [f"File not found: {filepath}"]
 
     # Parse TOML
     data = load_toml(filepath)
     if data is None:
-        return [f"Failed to parse TOML: {filepath}"]
+        return None, [f"Failed to parse TOML: {filepath}"]
 
     # Schema validation
     errors.extend(validate_toml_schema(data))
 
     # Slug validation
-    errors.extend(validate_slug_matches_directory(filepath, data))
-    errors.extend(validate_no_duplicate_slugs(filepath, data))
+    slug = data.get("addon", {}).get("slug", "")
+    errors.extend(validate_slug_matches_directory(filepath, slug))
+    errors.extend(validate_no_duplicate_slugs(filepath, slug))
+
+    return data, errors
+
+
+def validate_file(
+    filepath: Path,
+    check_repo: bool = True,
+    checked: tuple[dict | None, list[str]] | None = None,
+) -> list[str]:
+    """Validate a single TOML file. Returns list of errors.
+
+    ``checked`` is the file's check_toml_file result, if the caller already
+    has it; otherwise the file is parsed here.
+    """
+    data, errors = checked if checked is not None else check_toml_file(filepath)
+    errors = list(errors)
+
+    # A TOML with local errors can't pass, so don't spend API calls on it
+    if errors:
+        return errors
 
     # Repository validation (optional, can be slow)
     if check_repo:
-        errors.extend(validate_repository(data))
+        errors.extend(validate_repository(data.get("source", {})))
 
     return errors
 
@@ -341,18 +588,45 @@ def main():
         print("No files specified")
         sys.exit(1)
 
-    all_errors = []
-    for filepath_str in files:
-        filepath = Path(filepath_str)
-        print(f"Validating: {filepath}")
+    filepaths = [Path(f) for f in files]
 
-        errors = validate_file(filepath, check_repo=check_repo)
-        for error in errors:
-            all_errors.append(f"{filepath}: {error}")
-            print(f"  ERROR: {error}")
+    # Start from empty memos, so a re-entry in a long-lived process rechecks
+    fetch_repository.cache_clear()
+    check_github_source.cache_clear()
+    GRAPHQL_SOURCES.clear()
 
-        if not errors:
-            print("  OK")
+    # Repository checks are network-bound, so files are validated concurrently;
+    # each file's result is printed, in command-line order, as soon as it and
+    # every file before it are done
+    all_errors = []
+    with ThreadPoolExecutor(max_workers=min(16, len(filepaths))) as executor:
+        checked = list(executor.map(check_toml_file, filepaths))
+
+        # Resolve every GitHub source up front in as few GraphQL requests as
+        # possible; validate_repository falls back to REST for anything
+        # missing. TOMLs with local errors get no repository checks at all.
+        if check_repo:
+            sources = []
+            for data, errors in checked:
+                source = (data or {}).get("source", {})
+                if not errors and source.get("type") == "github" and source.get("repo"):
+                    sources.append((source["repo"], source.get("path")))
+            fetch_sources_graphql(sources)
+
+        results = executor.map(
+            lambda fp, c: validate_file(fp, check_repo=check_repo, checked=c),
+            filepaths,
+            checked,
+        )
+        for filepath, errors in zip(filepaths, results):
+            print(f"Validating: {filepath}")
+
+            for error in errors:
+                all_errors.append(f"{filepath}: {error}")
+                print(f"  ERROR: {error}")
+
+            if not errors:
+                print("  OK")
 
     print()
     if all_errors: